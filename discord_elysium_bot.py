@@ -1,12 +1,22 @@
+import asyncio
 import discord
 import os
+import sys
 
+from collections import namedtuple
 from discord.ext import commands
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 BOT_TOKEN = os.environ.get("BOT_TOKEN")
+NULL_TOKEN = "ZNULLLLZ"
+MAX_REPLIES = 3
 
 
-bot = commands.Bot(command_prefix="!", intents=discord.Intents(messages=True, message_content=True))
+bot = commands.Bot(command_prefix="!", intents=discord.Intents(messages=True, message_content=True), member_cache_flags=discord.MemberCacheFlags.none())
 
 
 phrases = [
@@ -40,27 +50,53 @@ phrases3 = [
 ]
 
 
+Rule = namedtuple("Rule", "positive negative reply")
+
+
+def build_group(group):
+    return frozenset(sys.intern(token.casefold()) for token in group if token != NULL_TOKEN)
+
+
+# phrases and phrases2 need a hit in every group; phrases3 needs a hit in its
+# first two groups and none in the third.
+rules = [Rule(tuple(map(build_group, phrase[0])), (), sys.intern(phrase[1])) for phrase in phrases + phrases2]
+rules += [Rule(tuple(map(build_group, phrase[0][:2])), (build_group(phrase[0][2]),), sys.intern(phrase[1])) for phrase in phrases3]
+
+
+# Every trigger token across all rules, so each message is scanned once per
+# distinct token instead of once per token per rule.
+triggers = frozenset(token for rule in rules for group in rule.positive + rule.negative for token in group)
+
+
 @bot.event
 async def on_message(message):
-    if (message.author.bot == False): 
-        for phrase in phrases:
-          if (any ((x.lower() in message.content.lower()) for x in phrase[0][0])) and (any ((x.lower() in message.content.lower()) for x in phrase[0][1])): 
-                # print(phrase[1])
-                # channel = message.channel.name
-                user_name = message.author.name
-                await message.reply(f"{phrase[1]}".format(user_name))
-        for phrase in phrases2:
-          if (any ((x.lower() in message.content.lower()) for x in phrase[0][0])) and (any((x.lower() in message.content.lower()) for x in phrase[0][1])) and (any((x.lower() in message.content.lower()) for x in phrase[0][2])): 
-                # print(phrase[1])
-                # channel = message.channel.name
-                user_name = message.author.name
-                await message.reply(f"{phrase[1]}".format(user_name))
-        for phrase in phrases3:
-          if (any ((x.lower() in message.content.lower()) for x in phrase[0][0])) and (any((x.lower() in message.content.lower()) for x in phrase[0][1])) and not (any((x.lower() in message.content.lower()) for x in phrase[0][2])): 
-                # print(phrase[1])
-                # channel = message.channel.name
-                user_name = message.author.name
-                await message.reply(f"{phrase[1]}".format(user_name))
-
-
-bot.run(BOT_TOKEN)
\ No newline at end of file
+    if message.author.bot:
+        return
+    content = message.content.casefold()
+    hits = {trigger for trigger in triggers if trigger in content}
+    if not hits:
+        return
+    user_name = message.author.name
+    replies = []
+    # Plain loops rather than all() over generators: no generator frame is
+    # created per rule, which dominated the cost of matching.
+    for positive, negative, reply in rules:
+        if reply in replies:
+            continue
+        for group in positive:
+            if hits.isdisjoint(group):
+                break
+        else:
+            for group in negative:
+                if not hits.isdisjoint(group):
+                    break
+            else:
+                replies.append(reply)
+                if len(replies) == MAX_REPLIES:
+                    break
+    await asyncio.gather(*(message.reply(reply.format(user_name)) for reply in replies))
+
+
+if uvloop is not None:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+bot.run(BOT_TOKEN)